@@ -12,6 +12,8 @@ Options:
   -l, --loss     Packet loss rate
   -n, --num NUM  Number of values generated by each client (default: 5)
   -b, --batch NUM Batch size for proposers (default: 1)
+  --lease SEC    Leader lease / failover timeout for proposers (default: 0.5)
+  --heartbeat SEC Heartbeat interval for proposers (default: 0.05)
   -h, --help     Show this help message and exit
 EOF
 }
@@ -24,6 +26,8 @@ LOSS=0.0
 CATCHUP=false
 SLEEP=2
 BATCH_SIZE=1
+LEASE=0.5
+HEARTBEAT=0.05
 
 NUM_CLIENTS=2
 NUM_PROPOSERS=2
@@ -50,6 +54,14 @@ while [[ $# -gt 0 ]]; do
             BATCH_SIZE="$2"
             shift 2
             ;;
+        --lease)
+            LEASE="$2"
+            shift 2
+            ;;
+        --heartbeat)
+            HEARTBEAT="$2"
+            shift 2
+            ;;
         --loss)
             LOSS="$2"
             shift 2
@@ -174,7 +186,7 @@ sleep 1
 
 echo "Starting proposers..."
 for ((i = 1; i <= ${NUM_PROPOSERS}; i++)); do
-  python3 src/main.py -r proposer -p $i -b $BATCH_SIZE $postfix &> "logs/proposer$i.log" &
+  python3 src/main.py -r proposer -p $i -b $BATCH_SIZE --lease $LEASE --heartbeat $HEARTBEAT $postfix &> "logs/proposer$i.log" &
 done
 sleep "$SLEEP"
 
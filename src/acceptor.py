@@ -20,7 +20,7 @@ class Acceptor:
         self.id = node_id
         
         # Paxos state
-        self.rnd = 0  # Highest promised round
+        self.rnd = (0, 0)  # Highest promised round: (counter, proposer_id)
         self.accepted_history = {}  # {instance_id: (v_rnd, v_val)}
         
         # Network
@@ -25,8 +25,16 @@ def main():
                         help="Enable debug output")
     parser.add_argument("-b", "--batch-size", type=int, default=1,
                         help="Batch size for proposers (default: 1)")
+    parser.add_argument("--heartbeat", type=float, default=0.05,
+                        help="Heartbeat interval in seconds for proposers (default: 0.05)")
+    parser.add_argument("--lease", type=float, default=0.5,
+                        help="Leader lease / failure timeout in seconds (default: 0.5)")
     args = parser.parse_args()
 
+    # Peers must be able to miss a heartbeat without being declared dead
+    if args.lease < 2 * args.heartbeat:
+        parser.error("--lease must be at least twice --heartbeat")
+
     config = load_config()
 
     logging.basicConfig(
@@ -37,7 +45,7 @@ def main():
     if args.role == "client":
         node = Client(config, args.pid)
     elif args.role == "proposer":
-        node = Proposer(config, args.pid, args.batch_size)
+        node = Proposer(config, args.pid, args.batch_size, args.heartbeat, args.lease)
     elif args.role == "acceptor":
         node = Acceptor(config, args.pid)
     elif args.role == "learner":
@@ -7,6 +7,15 @@ The proposer coordinates consensus rounds by:
 3. Sending Phase 2A (accept) messages with the proposed value
 4. Waiting for Phase 2B (accepted) responses before proceeding
 
+Only the leader runs Phases 1 and 2. Proposers multicast heartbeats to the
+proposers group and the live, eligible proposer with the lowest id is
+elected. The leader holds a lease that each quorum of acceptor replies
+renews; if it expires, the leader steps down and returns its in-flight batch
+to the backlog. Followers keep client requests in their backlog (pruned once
+they see them decided) and forward stale ones to the leader, so a new leader
+can pick up where the old one stopped. A crashed leader is replaced after at
+most `lease_timeout + heartbeat_interval` seconds.
+
 Optimizations:
 - Request batching: Multiple client values are batched into single instances
 - Proactive prepares: Pre-acquire quorum to skip Phase 1A on next request
@@ -15,19 +24,23 @@ Optimizations:
 import logging
 import math
 import pickle
+import select
+import time
 from collections import deque
 
 from utils import mcast_receiver, mcast_sender
 
 
 class Proposer:
-    def __init__(self, config, node_id, batch_size=1):
+    def __init__(self, config, node_id, batch_size=1,
+                 heartbeat_interval=0.05, lease_timeout=0.5):
         self.config = config
         self.id = node_id
         self.batch_size = batch_size
         
         # Paxos state
-        self.c_rnd = 0  # Current round number
+        self.c_rnd = (0, self.id)  # Current round number: (counter, proposer_id)
+        self.max_rnd_seen = (0, 0)  # Highest round observed in 1B/2B/heartbeats
         self.quorum_1B = []  # Phase 1B responses
         self.quorum_2B = []  # Phase 2B responses
         self.value = None  # Current batch being proposed
@@ -43,13 +56,30 @@ class Proposer:
         self.has_proactive_quorum = False
         self.proactive_instance = None
         
+        # Leader election
+        self.heartbeat_interval = heartbeat_interval
+        self.lease_timeout = lease_timeout
+        self.peers_last_seen = {}  # {proposer_id: last heartbeat time}
+        self.peers_eligible = {}  # {proposer_id: past its startup wait}
+        self.last_heartbeat_sent = 0
+        self.started_at = time.monotonic()
+        self.is_leader = False
+        self.lease_expires = 0  # Renewed by each quorum of 1B/2B replies
+        
+        # Backlog snapshot from the last forward check, to find stale requests
+        self.last_forward = 0
+        self.forward_candidates = set()
+        
+        # 2B tally for batches still in our backlog: {(v_rnd, v_val_tuple): count}
+        self.backlog_2B = {}
+        
         # Network
         self.r = mcast_receiver(config["proposers"])
         self.s = mcast_sender()
 
     def send_1A(self):
         """Send Phase 1A (prepare) message to all acceptors."""
-        self.c_rnd += 1
+        self.c_rnd = (max(self.c_rnd[0], self.max_rnd_seen[0]) + 1, self.id)
         self.quorum_1B = []
         self.quorum_2B = []
         self.has_proactive_quorum = False
@@ -74,33 +104,71 @@ class Proposer:
         self.queue.append((msg_num, client_id, value))
         logging.debug(f"Queued client request: msg_num={msg_num}, client={client_id}")
 
+        # Followers only keep the request in case they take over
+        if not self.is_leader:
+            return
+
         # If no value is being proposed, start a new proposal
         if self.value is None:
-            batch = self._create_batch()
-            self.value = batch
-            
-            # Optimization: skip 1A if we have a proactive quorum
-            if self.has_proactive_quorum and self.proactive_instance is not None:
-                self.consensus_instance = self.proactive_instance
-                msg_2A = pickle.dumps(["2A", self.c_rnd, self.value, self.id, self.consensus_instance])
-                self.s.sendto(msg_2A, self.config["acceptors"])
-                logging.debug(f"Sent 2A (proactive): instance={self.consensus_instance}")
-                self.has_proactive_quorum = False
-                self.proactive_instance = None
-            else:
-                self.send_1A()
+            self._start_proposal()
+
+    def _start_proposal(self):
+        """Propose the next batch from the queue."""
+        batch = self._create_batch()
+        self.value = batch
+        
+        # Optimization: skip 1A if we have a proactive quorum
+        if self.has_proactive_quorum and self.proactive_instance is not None:
+            self.consensus_instance = self.proactive_instance
+            msg_2A = pickle.dumps(["2A", self.c_rnd, self.value, self.id, self.consensus_instance])
+            self.s.sendto(msg_2A, self.config["acceptors"])
+            logging.debug(f"Sent 2A (proactive): instance={self.consensus_instance}")
+            self.has_proactive_quorum = False
+            self.proactive_instance = None
+        else:
+            self.send_1A()
+
+    def _forward_requests(self, requests):
+        """Forward queued client requests to whichever proposer is leader."""
+        # Send in batches to stay within the UDP datagram size
+        batch_size = 200
+        for i in range(0, len(requests), batch_size):
+            msg = pickle.dumps(["Forward", requests[i:i + batch_size]])
+            self.s.sendto(msg, self.config["proposers"])
+        logging.debug(f"Forwarded {len(requests)} queued requests")
+
+    def _handle_forward(self, msg):
+        """Handle client requests forwarded by a follower."""
+        if not self.is_leader:
+            return
+        
+        known = set(self.queue)
+        if self.value is not None:
+            known.update(self.value)
+        
+        for req in msg[1]:
+            if req not in known:
+                self.queue.append(req)
+                known.add(req)
+        
+        if self.value is None and self.queue:
+            self._start_proposal()
 
     def _handle_1B(self, msg):
         """Handle Phase 1B (promise) response from acceptor."""
         rnd, max_inst, proposer_id = msg[1:]
+        self.max_rnd_seen = max(self.max_rnd_seen, rnd)
+        self._check_preempted(rnd)
         
-        if rnd != self.c_rnd:
+        if rnd != self.c_rnd or not self.is_leader:
             return
         
         self.quorum_1B.append(max_inst)
         logging.debug(f"Received 1B: quorum_size={len(self.quorum_1B)}")
         
         if len(self.quorum_1B) == self.majority_acceptors:
+            self.lease_expires = time.monotonic() + self.lease_timeout
+            
             # Compute next available instance slot
             max_inst_global = max(self.quorum_1B)
             next_instance = max(self.consensus_instance, max_inst_global + 1)
@@ -120,6 +188,12 @@ class Proposer:
     def _handle_2B(self, msg):
         """Handle Phase 2B (accepted) response from acceptor."""
         v_rnd, v_val, proposer_id = msg[1:]
+        self.max_rnd_seen = max(self.max_rnd_seen, v_rnd)
+        self._prune_backlog(v_rnd, v_val)
+        self._check_preempted(v_rnd)
+        
+        if not self.is_leader:
+            return
         
         if v_rnd != self.c_rnd or proposer_id != self.id:
             return
@@ -130,6 +204,7 @@ class Proposer:
         if len(self.quorum_2B) == self.majority_acceptors:
             # Consensus reached
             logging.debug(f"Consensus reached for instance {self.consensus_instance}")
+            self.lease_expires = time.monotonic() + self.lease_timeout
             
             self.consensus_instance += 1
             self.value = None
@@ -141,11 +216,139 @@ class Proposer:
             
             self.send_1A()
 
+    def _check_preempted(self, rnd):
+        """Retry Phase 1 at once if acceptors moved past our round."""
+        # Happens when another proposer briefly led (e.g. while we were in our
+        # startup wait); waiting for the lease to expire would stall a full lease
+        if self.is_leader and rnd > self.c_rnd:
+            logging.debug(f"Round {self.c_rnd} preempted by {rnd}, retrying")
+            self.send_1A()
+
+    def _prune_backlog(self, v_rnd, v_val):
+        """Drop values from the backlog once a majority accepted them in one round."""
+        accepted = set(v_val)
+        if not any(req in accepted for req in self.queue):
+            return  # Our own batch, or already pruned
+        
+        key = (v_rnd, tuple(v_val))
+        self.backlog_2B[key] = self.backlog_2B.get(key, 0) + 1
+        if self.backlog_2B[key] < self.majority_acceptors:
+            return
+        
+        self.queue = deque(req for req in self.queue if req not in accepted)
+        logging.debug(f"Pruned decided values from backlog: remaining={len(self.queue)}")
+        
+        # Tallies for batches no longer in the backlog can never prune anything
+        queued = set(self.queue)
+        self.backlog_2B = {
+            key: count for key, count in self.backlog_2B.items()
+            if any(req in queued for req in key[1])
+        }
+
+    def _handle_heartbeat(self, msg):
+        """Handle heartbeat from another proposer."""
+        proposer_id, rnd, eligible = msg[1:]
+        
+        # Learn the current round so a (re)started proposer can outrank the
+        # previous leader with its first 1A
+        self.max_rnd_seen = max(self.max_rnd_seen, rnd)
+        
+        if proposer_id != self.id:
+            self.peers_last_seen[proposer_id] = time.monotonic()
+            self.peers_eligible[proposer_id] = eligible
+
+    def _is_eligible(self, now):
+        """Return True once this proposer may take part in the election."""
+        # Wait out one full lease after startup so we never overlap with a
+        # leader whose heartbeats we have not heard yet
+        return now - self.started_at >= self.lease_timeout
+
+    def _is_elected(self, now):
+        """Return True if the failure detector elects this proposer as leader."""
+        if not self._is_eligible(now):
+            return False
+        
+        # Lower ids still in their startup wait cannot lead yet, so they
+        # must not make the current leader step down
+        rivals = [
+            pid for pid, seen in self.peers_last_seen.items()
+            if now - seen < self.lease_timeout and self.peers_eligible[pid]
+        ]
+        return all(pid > self.id for pid in rivals)
+
+    def _become_leader(self, now):
+        """Take over as leader and start proposing the backlog."""
+        # The new leader gets one lease period to reach a quorum of acceptors
+        self.is_leader = True
+        self.lease_expires = now + self.lease_timeout
+        logging.info(f"Proposer {self.id} became leader (backlog={len(self.queue)})")
+        
+        if self.queue:
+            self.value = self._create_batch()
+        self.send_1A()
+
+    def _step_down(self, reason):
+        """Give up leadership, returning the in-flight batch to the backlog."""
+        self.is_leader = False
+        logging.info(f"Proposer {self.id} stepped down ({reason})")
+        
+        if self.value is not None:
+            self.queue.extendleft(reversed(self.value))
+            self.value = None
+        
+        self.quorum_1B = []
+        self.quorum_2B = []
+        self.has_proactive_quorum = False
+        self.proactive_instance = None
+
+    def _tick(self):
+        """Send heartbeats, update leadership and keep the leader lease alive."""
+        now = time.monotonic()
+        
+        if now - self.last_heartbeat_sent >= self.heartbeat_interval:
+            rnd = max(self.c_rnd, self.max_rnd_seen)
+            msg = pickle.dumps(["Heartbeat", self.id, rnd, self._is_eligible(now)])
+            self.s.sendto(msg, self.config["proposers"])
+            self.last_heartbeat_sent = now
+        
+        elected = self._is_elected(now)
+        if self.is_leader and not elected:
+            self._step_down("lower proposer id is alive")
+            # The new leader may never have seen our backlog
+            self._forward_requests(list(self.queue))
+        elif self.is_leader and now >= self.lease_expires:
+            # No quorum answered for a full lease (lost messages, preempted
+            # or partitioned); re-election below restarts Phase 1
+            self._step_down("lease expired")
+        
+        if elected and not self.is_leader:
+            self._become_leader(now)
+        
+        # A request still queued at a follower a lease later may never have
+        # reached the leader (message loss), so hand it over explicitly
+        if not self.is_leader and now - self.last_forward >= self.lease_timeout:
+            stale = [req for req in self.queue if req in self.forward_candidates]
+            if stale:
+                self._forward_requests(stale)
+            self.forward_candidates = set(self.queue)
+            self.last_forward = now
+        
+        # An idle leader renews its lease with a fresh proactive Phase 1
+        if (self.is_leader and self.value is None and self.has_proactive_quorum
+                and now >= self.lease_expires - self.lease_timeout / 2):
+            self.send_1A()
+
     def run(self):
         """Main proposer loop."""
         logging.info(f"Proposer {self.id} started (acceptors={self.config['n']})")
         
         while True:
+            self._tick()
+            
+            ready = select.select([self.r], [], [], self.heartbeat_interval)
+            if not ready[0]:
+                continue
+            
             msg, addr = self.r.recvfrom(2**16)
             msg = pickle.loads(msg)
             logging.debug(f"Received: {msg[0]}")
@@ -157,5 +360,9 @@ class Proposer:
                     self._handle_1B(msg)
                 case "2B":
                     self._handle_2B(msg)
+                case "Forward":
+                    self._handle_forward(msg)
+                case "Heartbeat":
+                    self._handle_heartbeat(msg)
                 case _:
                     logging.warning(f"Unknown message type: {msg[0]}")